@@ -4,16 +4,18 @@ Shows the differences between Linear Temporal Logic and Computation Tree Logic
 through a simple state machine and property evaluation.
 """
 
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
+from array import array
 import itertools
 
 class State:
     """Represents a state in our system with atomic propositions."""
-    def __init__(self, name: str, props: Set[str]):
+    def __init__(self, name: str, props: FrozenSet[str], mask: int = 0):
         self.name = name
-        self.props = props  # Set of atomic propositions true in this state
+        self.props = props  # Atomic propositions true in this state (shared, immutable)
+        self.mask = mask  # Same propositions as a bitmask (see StateMachine.ap_bits)
         
     def __str__(self):
         return f"{self.name}({', '.join(sorted(self.props))})"
@@ -21,25 +23,91 @@ class State:
     def __repr__(self):
         return self.__str__()
 
+class PathMatrix:
+    """Paths stored as int16 state ids, one fixed-width row per path.
+    
+    Row r occupies ids[r * width : r * width + lengths[r]]; the rest of the
+    row is padding. State names are only looked up for display.
+    """
+    
+    def __init__(self, width: int, state_names: List[str]):
+        self.width = width
+        self.state_names = state_names
+        self.ids = array('h')
+        self.lengths = array('h')
+        self._padding = array('h', [0]) * width
+    
+    def append(self, path_ids: List[int]):
+        """Copy a path of state ids into a new row."""
+        self.ids.extend(path_ids)
+        self.ids.extend(self._padding[len(path_ids):])
+        self.lengths.append(len(path_ids))
+    
+    def __len__(self) -> int:
+        return len(self.lengths)
+    
+    def row(self, r: int) -> array:
+        """State ids of path r."""
+        start = r * self.width
+        return self.ids[start:start + self.lengths[r]]
+    
+    def names(self, r: int) -> List[str]:
+        """State names of path r."""
+        return [self.state_names[state_id] for state_id in self.row(r)]
+
 class StateMachine:
     """A simple state machine for demonstrating temporal logic."""
     
     def __init__(self):
         self.states: Dict[str, State] = {}
         self.transitions: Dict[str, List[str]] = {}
+        self.predecessors: Dict[str, List[str]] = {}  # Inverse of transitions
+        self.ap_bits: Dict[str, int] = {}  # Atomic proposition -> its bit
+        self.masks: Dict[str, int] = {}  # State -> bitmask of its propositions
+        self.state_ids: Dict[str, int] = {}  # State -> dense integer id
+        self.state_names: List[str] = []  # Id -> state
+        self.id_masks: List[int] = []  # Id -> bitmask of its propositions
+        self._props_cache: Dict[FrozenSet[str], FrozenSet[str]] = {}  # One instance per distinct label set
         self.initial_state: Optional[str] = None
+        self.generation = 0  # Bumped on every change so evaluators can drop stale graphs
+    
+    def _state_id(self, name: str) -> int:
+        """Id of a state, assigning the next one on first sight."""
+        if name not in self.state_ids:
+            self.state_ids[name] = len(self.state_names)
+            self.state_names.append(name)
+            self.id_masks.append(0)
+        return self.state_ids[name]
     
-    def add_state(self, name: str, props: Set[str]):
+    def add_state(self, name: str, props: Iterable[str]):
         """Add a state with its atomic propositions."""
-        self.states[name] = State(name, props)
+        props = frozenset(props)
+        props = self._props_cache.setdefault(props, props)
+        mask = 0
+        for prop in props:
+            if prop not in self.ap_bits:
+                self.ap_bits[prop] = 1 << len(self.ap_bits)
+            mask |= self.ap_bits[prop]
+        self.states[name] = State(name, props, mask)
+        self.masks[name] = mask
+        self.id_masks[self._state_id(name)] = mask
         if name not in self.transitions:
             self.transitions[name] = []
+        if name not in self.predecessors:
+            self.predecessors[name] = []
+        self.generation += 1
     
     def add_transition(self, from_state: str, to_state: str):
         """Add a transition between states."""
+        self._state_id(from_state)
+        self._state_id(to_state)
         if from_state not in self.transitions:
             self.transitions[from_state] = []
         self.transitions[from_state].append(to_state)
+        if to_state not in self.predecessors:
+            self.predecessors[to_state] = []
+        self.predecessors[to_state].append(from_state)
+        self.generation += 1
     
     def set_initial(self, state: str):
         """Set the initial state."""
@@ -49,40 +117,114 @@ class StateMachine:
         """Get all successor states."""
         return self.transitions.get(state, [])
     
+    def get_predecessors(self, state: str) -> List[str]:
+        """Get all predecessor states."""
+        return self.predecessors.get(state, [])
+    
+    def prop_bit(self, prop: str) -> int:
+        """Bit for a proposition; 0 if no state carries it."""
+        return self.ap_bits.get(prop, 0)
+    
     def has_prop(self, state: str, prop: str) -> bool:
         """Check if a proposition is true in a state."""
-        return prop in self.states[state].props
+        return bool(self.masks[state] & self.ap_bits.get(prop, 0))
+    
+    def path_masks(self, path: List[str], start_pos: int = 0) -> List[int]:
+        """Proposition bitmasks of the states along a path."""
+        masks = self.masks
+        return [masks[state] for state in itertools.islice(path, start_pos, None)]
     
     def generate_paths(self, start_state: str, max_length: int = 10) -> List[List[str]]:
-        """Generate all possible paths up to max_length from start_state."""
-        paths = []
+        """Generate all simple paths of up to max_length states from start_state.
         
-        def dfs(current_path: List[str], visited_cycles: Set[Tuple[str, ...]]):
-            if len(current_path) > max_length:
-                return
+        A path ends at a dead end, at max_length, or when its next state is
+        already on the path; in the last case that state is appended so the
+        path closes its cycle.
+        """
+        return list(self.iter_paths(start_state, max_length))
+    
+    def iter_paths(self, start_state: str, max_length: int = 10) -> Iterator[List[str]]:
+        """Yield the paths of generate_paths one at a time, searching only as far as consumed."""
+        names = self.state_names
+        for path_ids in self.iter_path_ids(start_state, max_length):
+            yield [names[state_id] for state_id in path_ids]
+    
+    def generate_path_matrix(self, start_state: str, max_length: int = 10) -> PathMatrix:
+        """Generate the same paths as generate_paths, as rows of state ids."""
+        matrix = PathMatrix(max(max_length, 1), self.state_names)
+        for path_ids in self.iter_path_ids(start_state, max_length):
+            matrix.append(path_ids)
+        return matrix
+    
+    def iter_path_ids(self, start_state: str, max_length: int = 10) -> Iterator[Tuple[int, ...]]:
+        """Yield the paths of generate_paths as tuples of state ids."""
+        successor_ids = [[self.state_ids[next_state] for next_state in self.get_successors(name)]
+                         for name in self.state_names]
+        start = self.state_ids[start_state]
+        path = [start]
+        if not successor_ids[start] or max_length <= 1:
+            yield tuple(path)
+            return
+        
+        in_path = bytearray(len(self.state_names))
+        in_path[start] = 1
+        
+        # Iterative DFS: one successor iterator per state on the current path
+        stack = [iter(successor_ids[start])]
+        while stack:
+            next_id = next(stack[-1], -1)
+            if next_id < 0:  # All successors explored, backtrack
+                stack.pop()
+                in_path[path.pop()] = 0
+                continue
             
-            current_state = current_path[-1]
-            successors = self.get_successors(current_state)
+            path.append(next_id)
+            if in_path[next_id]:  # Cycle closed
+                yield tuple(path)
+                path.pop()
+                continue
             
-            if not successors:  # Dead end
-                paths.append(current_path.copy())
-                return
+            if not successor_ids[next_id] or len(path) == max_length:  # Dead end or length bound
+                yield tuple(path)
+                path.pop()
+                continue
             
-            for next_state in successors:
-                new_path = current_path + [next_state]
-                
-                # Detect cycles to avoid infinite recursion
-                if len(new_path) >= 3:
-                    cycle_check = tuple(new_path[-3:])
-                    if cycle_check in visited_cycles:
-                        paths.append(new_path)
-                        continue
-                    visited_cycles.add(cycle_check)
-                
-                dfs(new_path, visited_cycles)
+            in_path[next_id] = 1
+            stack.append(iter(successor_ids[next_id]))
+
+class PathBatch:
+    """A set of paths laid out column by column for bit-parallel evaluation.
+    
+    Bit i of every integer below stands for path i, so a single integer
+    operation applies one step of an LTL operator to all paths at once.
+    """
+    
+    def __init__(self, state_machine: StateMachine, paths: PathMatrix):
+        self.paths = paths
+        self.all_paths = (1 << len(paths)) - 1
+        width = max(paths.lengths, default=0)
+        self.alive: List[int] = [0] * width  # Paths that still have a state at position k
+        self.columns: List[Dict[int, int]] = [{} for _ in range(width)]  # Position -> AP bit -> paths
         
-        dfs([start_state], set())
-        return paths
+        id_masks = state_machine.id_masks
+        for i in range(len(paths)):
+            path_bit = 1 << i
+            for k, state_id in enumerate(paths.row(i)):
+                self.alive[k] |= path_bit
+                column = self.columns[k]
+                mask = id_masks[state_id]
+                while mask:
+                    ap_bit = mask & -mask
+                    column[ap_bit] = column.get(ap_bit, 0) | path_bit
+                    mask ^= ap_bit
+    
+    def column(self, pos: int, bit: int) -> int:
+        """Paths whose state at pos carries the proposition bit."""
+        return self.columns[pos].get(bit, 0)
+    
+    def unpack(self, selected: int) -> List[bool]:
+        """Per-path booleans from a path bitset."""
+        return [bool(selected >> i & 1) for i in range(len(self.paths))]
 
 class LTLEvaluator:
     """Evaluates LTL formulas on linear paths."""
@@ -92,17 +234,13 @@ class LTLEvaluator:
     
     def eventually(self, path: List[str], prop: str, start_pos: int = 0) -> bool:
         """F prop: Eventually prop holds along the path."""
-        for i in range(start_pos, len(path)):
-            if self.sm.has_prop(path[i], prop):
-                return True
-        return False
+        bit = self.sm.prop_bit(prop)
+        return any(mask & bit for mask in self.sm.path_masks(path, start_pos))
     
     def globally(self, path: List[str], prop: str, start_pos: int = 0) -> bool:
         """G prop: Globally prop holds along the path."""
-        for i in range(start_pos, len(path)):
-            if not self.sm.has_prop(path[i], prop):
-                return False
-        return True
+        bit = self.sm.prop_bit(prop)
+        return all(mask & bit for mask in self.sm.path_masks(path, start_pos))
     
     def next_state(self, path: List[str], prop: str, pos: int) -> bool:
         """X prop: Next state satisfies prop."""
@@ -112,13 +250,89 @@ class LTLEvaluator:
     
     def until(self, path: List[str], prop1: str, prop2: str, start_pos: int = 0) -> bool:
         """prop1 U prop2: prop1 until prop2."""
-        for i in range(start_pos, len(path)):
-            if self.sm.has_prop(path[i], prop2):
+        bit1 = self.sm.prop_bit(prop1)
+        bit2 = self.sm.prop_bit(prop2)
+        for mask in self.sm.path_masks(path, start_pos):
+            if mask & bit2:
                 return True
-            if not self.sm.has_prop(path[i], prop1):
+            if not mask & bit1:
                 return False
         return False
     
+    def eventually_all(self, batch: PathBatch, prop: str) -> List[bool]:
+        """F prop on every path of the batch."""
+        bit = self.sm.prop_bit(prop)
+        hits = 0
+        for pos in range(len(batch.alive)):
+            hits |= batch.column(pos, bit)
+        return batch.unpack(hits)
+    
+    def globally_all(self, batch: PathBatch, prop: str) -> List[bool]:
+        """G prop on every path of the batch."""
+        bit = self.sm.prop_bit(prop)
+        failed = 0
+        for pos, alive in enumerate(batch.alive):
+            failed |= alive & ~batch.column(pos, bit)
+        return batch.unpack(batch.all_paths & ~failed)
+    
+    def until_all(self, batch: PathBatch, prop1: str, prop2: str) -> List[bool]:
+        """prop1 U prop2 on every path of the batch."""
+        bit1 = self.sm.prop_bit(prop1)
+        bit2 = self.sm.prop_bit(prop2)
+        satisfied = 0
+        pending = batch.all_paths  # prop1 has held on every earlier state
+        for pos in range(len(batch.alive)):
+            hit2 = batch.column(pos, bit2)
+            satisfied |= pending & hit2
+            pending &= batch.column(pos, bit1) & ~hit2
+            if not pending:
+                break
+        return batch.unpack(satisfied)
+    
+    def evaluate_batch_on_all_paths(self, formula_name: str, batch_func) -> Dict[str, bool]:
+        """Evaluate a formula on all paths from initial state in one batch.
+        
+        batch_func takes a PathBatch and returns one boolean per path.
+        """
+        if not self.sm.initial_state:
+            return {}
+        
+        paths = self.sm.generate_path_matrix(self.sm.initial_state)
+        batch_results = batch_func(PathBatch(self.sm, paths))
+        
+        return {
+            f"Path {i+1}: {' → '.join(paths.names(i))}": result
+            for i, result in enumerate(batch_results)
+        }
+    
+    def evaluate_universal(self, formula_func) -> Tuple[bool, Optional[List[str]]]:
+        """Check that every path from the initial state satisfies a formula.
+        
+        Stops at the first failing path and returns (False, that path) as a
+        counterexample; returns (True, None) if no path fails.
+        """
+        if not self.sm.initial_state:
+            return True, None
+        
+        for path in self.sm.iter_paths(self.sm.initial_state):
+            if not formula_func(path):
+                return False, path
+        return True, None
+    
+    def evaluate_existential(self, formula_func) -> Tuple[bool, Optional[List[str]]]:
+        """Check that some path from the initial state satisfies a formula.
+        
+        Stops at the first satisfying path and returns (True, that path) as a
+        witness; returns (False, None) if no path satisfies it.
+        """
+        if not self.sm.initial_state:
+            return False, None
+        
+        for path in self.sm.iter_paths(self.sm.initial_state):
+            if formula_func(path):
+                return True, path
+        return False, None
+    
     def evaluate_on_all_paths(self, formula_name: str, formula_func) -> Dict[str, bool]:
         """Evaluate a formula on all paths from initial state."""
         if not self.sm.initial_state:
@@ -134,104 +348,153 @@ class LTLEvaluator:
         return results
 
 class CTLEvaluator:
-    """Evaluates CTL formulas on state trees."""
+    """Evaluates CTL formulas on state trees.
+    
+    States are numbered by the state machine's integer ids, and predecessors
+    are stored in CSR form, so the predecessors of state v are
+    preds_idx[preds_indptr[v]:preds_indptr[v + 1]]. Each operator is
+    computed once per proposition as a fixpoint over that graph, kept as a
+    bytearray membership map, and cached so repeated queries from different
+    states are a single index. The graph and cache are rebuilt whenever the
+    state machine has changed since they were built.
+    """
     
     def __init__(self, state_machine: StateMachine):
         self.sm = state_machine
+        self._cache: Dict[Tuple[str, int], bytearray] = {}
+        self._build()
     
-    def exists_eventually(self, state: str, prop: str, visited: Set[str] = None) -> bool:
-        """EF prop: There exists a path where prop eventually holds."""
-        if visited is None:
-            visited = set()
-        
-        if state in visited:  # Cycle detection
-            return False
-        
-        if self.sm.has_prop(state, prop):
-            return True
+    def _build(self):
+        """Build the out-degrees and CSR predecessors of the current state machine."""
+        sm = self.sm
+        self.out_degree = array('i', (len(sm.get_successors(name)) for name in sm.state_names))
         
-        visited.add(state)
-        successors = self.sm.get_successors(state)
+        self.preds_indptr = array('i', [0])
+        self.preds_idx = array('i')
+        for name in sm.state_names:
+            self.preds_idx.extend(sm.state_ids[prev_state] for prev_state in sm.get_predecessors(name))
+            self.preds_indptr.append(len(self.preds_idx))
         
-        for next_state in successors:
-            if self.exists_eventually(next_state, prop, visited.copy()):
-                return True
-        
-        return False
+        self._cache.clear()
+        self._generation = sm.generation
+    
+    def _labelled(self, bit: int) -> bytearray:
+        """Membership map of the states carrying the proposition bit."""
+        return bytearray(1 if mask & bit else 0 for mask in self.sm.id_masks)
+    
+    def _complement(self, members: bytearray) -> bytearray:
+        """Membership map of the states not in members."""
+        return bytearray(1 - member for member in members)
+    
+    def _predecessors(self, v: int):
+        """Ids of the predecessors of state v."""
+        return self.preds_idx[self.preds_indptr[v]:self.preds_indptr[v + 1]]
+    
+    def _backward_reach(self, targets: bytearray) -> bytearray:
+        """States from which some path reaches a state in targets."""
+        reached = bytearray(targets)
+        worklist = [v for v, member in enumerate(reached) if member]
+        while worklist:
+            v = worklist.pop()
+            for u in self._predecessors(v):
+                if not reached[u]:
+                    reached[u] = 1
+                    worklist.append(u)
+        return reached
+    
+    def _sat(self, op: str, prop: str) -> bytearray:
+        """Membership map of the states satisfying `op prop`, computed once and cached."""
+        if self._generation != self.sm.generation:
+            # The state machine changed since the graph was built
+            self._build()
+        bit = self.sm.prop_bit(prop)
+        key = (op, bit)
+        if key not in self._cache:
+            if op == "EF":
+                result = self._backward_reach(self._labelled(bit))
+            elif op == "AG":
+                # AG p = ¬EF ¬p
+                result = self._complement(self._backward_reach(self._complement(self._labelled(bit))))
+            elif op == "AG EF":
+                # AG EF p = ¬EF ¬(EF p), reusing the cached EF p
+                reachable = self._sat("EF", prop)
+                result = self._complement(self._backward_reach(self._complement(reachable)))
+            elif op == "AF":
+                result = self._all_eventually_fixpoint(bit)
+            elif op == "EG":
+                result = self._exists_globally_fixpoint(bit)
+            else:
+                raise ValueError(f"Unknown CTL operator: {op}")
+            self._cache[key] = result
+        return self._cache[key]
+    
+    def _all_eventually_fixpoint(self, bit: int) -> bytearray:
+        """Least fixpoint Z = p ∨ (AX Z ∧ EX true)."""
+        result = self._labelled(bit)
+        # A state joins once every one of its successors is in the result
+        pending = list(self.out_degree)
+        worklist = [v for v, member in enumerate(result) if member]
+        while worklist:
+            v = worklist.pop()
+            for u in self._predecessors(v):
+                if result[u]:
+                    continue
+                pending[u] -= 1
+                if pending[u] == 0:
+                    result[u] = 1
+                    worklist.append(u)
+        return result
+    
+    def _exists_globally_fixpoint(self, bit: int) -> bytearray:
+        """Greatest fixpoint Z = p ∧ EX Z."""
+        result = self._labelled(bit)
+        # Count successors inside the candidate set; drop states left with none
+        support = [0] * len(result)
+        for v, member in enumerate(result):
+            if member:
+                for u in self._predecessors(v):
+                    support[u] += 1
+        worklist = [v for v, member in enumerate(result) if member and support[v] == 0]
+        while worklist:
+            v = worklist.pop()
+            result[v] = 0
+            for u in self._predecessors(v):
+                if result[u]:
+                    support[u] -= 1
+                    if support[u] == 0:
+                        worklist.append(u)
+        return result
+    
+    def exists_eventually(self, state: str, prop: str) -> bool:
+        """EF prop: There exists a path where prop eventually holds."""
+        return bool(self._sat("EF", prop)[self.sm.state_ids[state]])
     
-    def all_eventually(self, state: str, prop: str, visited: Set[str] = None) -> bool:
+    def all_eventually(self, state: str, prop: str) -> bool:
         """AF prop: On all paths, prop eventually holds."""
-        if visited is None:
-            visited = set()
-        
-        if state in visited:  # Cycle without prop - fails
-            return False
-        
-        if self.sm.has_prop(state, prop):
-            return True
-        
-        successors = self.sm.get_successors(state)
-        if not successors:  # Dead end without prop
-            return False
-        
-        visited.add(state)
-        
-        for next_state in successors:
-            if not self.all_eventually(next_state, prop, visited.copy()):
-                return False
-        
-        return True
+        return bool(self._sat("AF", prop)[self.sm.state_ids[state]])
     
-    def all_globally(self, state: str, prop: str, visited: Set[str] = None) -> bool:
+    def all_globally(self, state: str, prop: str) -> bool:
         """AG prop: On all paths, prop always holds."""
-        if visited is None:
-            visited = set()
-        
-        if not self.sm.has_prop(state, prop):
-            return False
-        
-        if state in visited:  # Safe cycle
-            return True
-        
-        visited.add(state)
-        successors = self.sm.get_successors(state)
-        
-        for next_state in successors:
-            if not self.all_globally(next_state, prop, visited.copy()):
-                return False
-        
-        return True
+        return bool(self._sat("AG", prop)[self.sm.state_ids[state]])
     
-    def exists_globally(self, state: str, prop: str, visited: Set[str] = None) -> bool:
+    def exists_globally(self, state: str, prop: str) -> bool:
         """EG prop: There exists a path where prop always holds."""
-        if visited is None:
-            visited = set()
-        
-        if not self.sm.has_prop(state, prop):
-            return False
-        
-        if state in visited:  # Found a cycle where prop holds
-            return True
-        
-        visited.add(state)
-        successors = self.sm.get_successors(state)
-        
-        for next_state in successors:
-            if self.exists_globally(next_state, prop, visited.copy()):
-                return True
-        
-        return False
+        return bool(self._sat("EG", prop)[self.sm.state_ids[state]])
+    
+    def always_possibly(self, state: str, prop: str) -> bool:
+        """AG EF prop: From every reachable state, prop remains reachable."""
+        return bool(self._sat("AG EF", prop)[self.sm.state_ids[state]])
 
 def create_example_system() -> StateMachine:
     """Create an example system: a simple request-response protocol."""
     sm = StateMachine()
     
     # States: idle, requesting, processing, responding
-    sm.add_state("idle", {"idle"})
-    sm.add_state("requesting", {"req", "active"})
-    sm.add_state("processing", {"req", "active", "busy"})
-    sm.add_state("responding", {"ack", "active"})
-    sm.add_state("error", {"error"})
+    sm.add_state("idle", frozenset({"idle"}))
+    sm.add_state("requesting", frozenset({"req", "active"}))
+    sm.add_state("processing", frozenset({"req", "active", "busy"}))
+    sm.add_state("responding", frozenset({"ack", "active"}))
+    sm.add_state("error", frozenset({"error"}))
     
     # Transitions
     sm.add_transition("idle", "requesting")
@@ -281,15 +544,22 @@ def demonstrate_ltl_vs_ctl():
     print("   CTL: EF ack vs AF ack\n")
     
     # LTL: Check on all paths
-    ltl_results = ltl_eval.evaluate_on_all_paths(
+    ltl_results = ltl_eval.evaluate_batch_on_all_paths(
         "F ack", 
-        lambda path: ltl_eval.eventually(path, "ack")
+        lambda batch: ltl_eval.eventually_all(batch, "ack")
     )
     
     print("   LTL Results (F ack on each path):")
     for path, result in ltl_results.items():
         print(f"     {path}: {result}")
     
+    holds, counterexample = ltl_eval.evaluate_universal(
+        lambda path: ltl_eval.eventually(path, "ack")
+    )
+    print(f"\n   F ack on all paths: {holds}")
+    if counterexample:
+        print(f"     Counterexample: {' → '.join(counterexample)}")
+    
     # CTL: Check on state tree
     ef_ack = ctl_eval.exists_eventually("idle", "ack")
     af_ack = ctl_eval.all_eventually("idle", "ack")
@@ -304,17 +574,24 @@ def demonstrate_ltl_vs_ctl():
     print("   CTL: AG ¬error (always no error on all paths)\n")
     
     # LTL: Check on all paths
-    ltl_safety = ltl_eval.evaluate_on_all_paths(
+    ltl_safety = ltl_eval.evaluate_batch_on_all_paths(
         "G ¬error",
-        lambda path: ltl_eval.globally(path, "error") == False
+        lambda batch: [not result for result in ltl_eval.eventually_all(batch, "error")]
     )
     
     print("   LTL Results (G ¬error on each path):")
     for path, result in ltl_safety.items():
         print(f"     {path}: {result}")
     
+    holds, counterexample = ltl_eval.evaluate_universal(
+        lambda path: not ltl_eval.eventually(path, "error")
+    )
+    print(f"\n   G ¬error on all paths: {holds}")
+    if counterexample:
+        print(f"     Counterexample: {' → '.join(counterexample)}")
+    
     # CTL: Check on state tree
-    ag_not_error = ctl_eval.all_globally("idle", "error") == False
+    ag_not_error = not ctl_eval.exists_eventually("idle", "error")  # AG ¬p = ¬EF p
     
     print(f"\n   CTL Results from initial state:")
     print(f"     AG ¬error (no error on all paths): {ag_not_error}")
@@ -342,26 +619,7 @@ def demonstrate_ltl_vs_ctl():
         print(f"     {path}: {result}")
     
     # CTL: AG EF active
-    def ag_ef_active(state, visited=None):
-        """AG EF active: always globally, exists eventually active"""
-        if visited is None:
-            visited = set()
-        if state in visited:
-            return True  # Cycle is okay for AG EF
-        
-        # EF active from current state
-        if not ctl_eval.exists_eventually(state, "active"):
-            return False
-        
-        visited.add(state)
-        successors = sm.get_successors(state)
-        
-        for next_state in successors:
-            if not ag_ef_active(next_state, visited.copy()):
-                return False
-        return True
-    
-    ag_ef_result = ag_ef_active("idle")
+    ag_ef_result = ctl_eval.always_possibly("idle", "active")
     print(f"\n   CTL Results from initial state:")
     print(f"     AG EF active (always possible to reach active): {ag_ef_result}")
     
@@ -1,29 +1,79 @@
+import heapq
+import weakref
+
+# Shared Term instances keyed by (name, args); entries vanish once unused
+_interned_terms = weakref.WeakValueDictionary()
+
+def _is_var(name):
+    """A string names a variable iff its first character is an uppercase letter."""
+    return type(name) is str and 'A' <= name[:1] <= 'Z'
+
+class _VarSlot:
+    """A numbered variable placeholder in a variant key; never equal to a constant."""
+    __slots__ = ('index',)
+    
+    def __init__(self, index):
+        self.index = index
+    
+    def __eq__(self, other):
+        return type(other) is _VarSlot and self.index == other.index
+    
+    def __hash__(self):
+        return hash((_VarSlot, self.index))
+    
+    def __str__(self):
+        return f"_{self.index}"
+
 class Term:
     """Represents a term that can be a constant, variable, or compound term."""
+    __slots__ = ('name', 'args', 'is_variable', '_hash', '__weakref__')
+    
     def __init__(self, name, args=None):
         self.name = name
         self.args = args or []
-        self.is_variable = name.isupper() if isinstance(name, str) else False
+        # Renamed-apart variables are named by (original name, stamp) tuples
+        self.is_variable = type(name) is tuple or _is_var(name)
+        self._hash = None  # Computed on first use; terms are not mutated
+    
+    @classmethod
+    def intern(cls, name, args=None):
+        """Return the shared Term for name(args), creating it if needed."""
+        args = list(args) if args else []
+        key = (name, tuple(args))
+        term = _interned_terms.get(key)
+        if term is None:
+            term = cls(name, args)
+            _interned_terms[key] = term
+        return term
     
     def __str__(self):
         if self.args:
             args_str = ", ".join(str(arg) for arg in self.args)
             return f"{self.name}({args_str})"
+        if type(self.name) is tuple:
+            return f"{self.name[0]}_{self.name[1]}"
         return str(self.name)
     
     def __eq__(self, other):
+        if self is other:
+            return True
         return (isinstance(other, Term) and 
                 self.name == other.name and 
                 self.args == other.args)
     
     def __hash__(self):
-        return hash((self.name, tuple(self.args)))
+        if self._hash is None:
+            self._hash = hash((self.name, tuple(self.args)))
+        return self._hash
 
 class Clause:
     """Represents a clause: either a fact or a rule (head :- body)."""
-    def __init__(self, head, body=None):
+    __slots__ = ('head', 'body', 'vars')
+    
+    def __init__(self, head, body=None, variables=()):
         self.head = head  # Term
         self.body = body or []  # List of Terms (empty for facts)
+        self.vars = variables  # Variable names to rename apart on each use
     
     def is_fact(self):
         return len(self.body) == 0
@@ -44,13 +94,17 @@ class KnowledgeBase:
     def __init__(self):
         self.clauses = []  # List of Clause objects
         self.facts = set()  # Cache of ground facts for quick lookup
+        self.index = {}  # (predicate, arity) -> clauses, in insertion order
+        self.fact_args = {}  # (predicate, arity) -> per argument position, value -> (seq, ground fact)
+        self.unindexed = {}  # (predicate, arity) -> (seq, clause) for rules and non-ground facts
+        self.generation = 0  # Bumped on every change so engines can drop stale tables
     
     def add_fact(self, predicate, *args):
         """Add a fact to the knowledge base."""
-        term = Term(predicate, list(args))
-        clause = Clause(term)
-        self.clauses.append(clause)
-        if not any(arg for arg in args if isinstance(arg, str) and arg.isupper()):
+        term = Term.intern(predicate, args)
+        clause = Clause(term, variables=self._variables([term]))
+        self._add_clause(clause)
+        if not clause.vars:
             # Only cache ground facts (no variables)
             self.facts.add(term)
     
@@ -62,18 +116,70 @@ class KnowledgeBase:
             head_args: arguments for the head
             body_conditions: list of (predicate, args) tuples for the body
         """
-        head = Term(head_pred, head_args)
-        body = [Term(pred, args) for pred, args in body_conditions]
-        clause = Clause(head, body)
+        head = Term.intern(head_pred, head_args)
+        body = [Term.intern(pred, args) for pred, args in body_conditions]
+        clause = Clause(head, body, self._variables([head] + body))
+        self._add_clause(clause)
+    
+    @staticmethod
+    def _variables(terms):
+        """Names of the variables occurring in terms, in order of appearance."""
+        found = {}
+        pending = list(reversed(terms))
+        while pending:
+            term = pending.pop()
+            if isinstance(term, Term):
+                if term.is_variable:
+                    found[term.name] = None
+                else:
+                    pending.extend(reversed(term.args))
+            elif _is_var(term):
+                found[term] = None
+        return tuple(found)
+    
+    def _add_clause(self, clause):
+        """Store a clause and index it by predicate name and arity."""
+        entry = (len(self.clauses), clause)  # Insertion order, for merging candidate lists
         self.clauses.append(clause)
+        key = (clause.head.name, len(clause.head.args))
+        self.index.setdefault(key, []).append(clause)
+        if clause.is_fact() and not clause.vars:
+            positions = self.fact_args.setdefault(key, [{} for _ in clause.head.args])
+            for position, arg in enumerate(clause.head.args):
+                if isinstance(arg, Term) and not arg.args:
+                    arg = arg.name
+                positions[position].setdefault(arg, []).append(entry)
+        else:
+            self.unindexed.setdefault(key, []).append(entry)
+        self.generation += 1
     
     def get_matching_clauses(self, goal):
         """Get all clauses whose head could potentially match the goal."""
-        matching = []
-        for clause in self.clauses:
-            if clause.head.name == goal.name and len(clause.head.args) == len(goal.args):
-                matching.append(clause)
-        return matching
+        return self.index.get((goal.name, len(goal.args)), ())
+    
+    def get_candidate_clauses(self, goal_key):
+        """
+        Get the clauses that could match a resolved goal whose bound atom
+        arguments are plain names (see BackwardsChainingEngine._variant_key).
+        Ground facts are narrowed to those sharing the goal's most selective
+        bound argument; rules and non-ground facts are always included.
+        Clauses come back in the order they were added.
+        """
+        key = (goal_key.name, len(goal_key.args))
+        positions = self.fact_args.get(key)
+        if positions is None:
+            return self.index.get(key, ())
+        
+        facts = None
+        for position, arg in enumerate(goal_key.args):
+            if type(arg) is str:
+                matches = positions[position].get(arg, ())
+                if facts is None or len(matches) < len(facts):
+                    facts = matches
+        if facts is None:
+            return self.index.get(key, ())
+        merged = heapq.merge(facts, self.unindexed.get(key, ()), key=lambda entry: entry[0])
+        return [clause for _, clause in merged]
     
     def print_knowledge_base(self):
         """Print all facts and rules in the knowledge base."""
@@ -97,35 +203,29 @@ class Unification:
         if substitution is None:
             substitution = {}
         
-        # Apply existing substitutions
-        term1 = Unification.substitute(term1, substitution)
-        term2 = Unification.substitute(term2, substitution)
+        # Follow existing bindings; no substituted copies are built
+        term1 = Unification.walk(term1, substitution)
+        term2 = Unification.walk(term2, substitution)
         
         # Same terms unify
         if term1 == term2:
             return substitution
         
-        # Variable unification
+        # Variable unification (walked variables are always unbound)
         if term1.is_variable:
-            if term1.name in substitution:
-                return Unification.unify(substitution[term1.name], term2, substitution)
-            else:
-                substitution[term1.name] = term2
-                return substitution
+            substitution[term1.name] = term2
+            return substitution
         
         if term2.is_variable:
-            if term2.name in substitution:
-                return Unification.unify(term1, substitution[term2.name], substitution)
-            else:
-                substitution[term2.name] = term1
-                return substitution
+            substitution[term2.name] = term1
+            return substitution
         
         # Compound term unification
         if (term1.name == term2.name and 
             len(term1.args) == len(term2.args)):
             for arg1, arg2 in zip(term1.args, term2.args):
-                arg1_term = Term(arg1) if not isinstance(arg1, Term) else arg1
-                arg2_term = Term(arg2) if not isinstance(arg2, Term) else arg2
+                arg1_term = Term.intern(arg1) if not isinstance(arg1, Term) else arg1
+                arg2_term = Term.intern(arg2) if not isinstance(arg2, Term) else arg2
                 substitution = Unification.unify(arg1_term, arg2_term, substitution)
                 if substitution is None:
                     return None
@@ -133,137 +233,273 @@ class Unification:
         
         return None  # Cannot unify
     
+    @staticmethod
+    def walk(term, substitution):
+        """Follow variable bindings until reaching an unbound variable or non-variable term."""
+        while term.is_variable and term.name in substitution:
+            term = substitution[term.name]
+        return term
+    
     @staticmethod
     def substitute(term, substitution):
-        """Apply substitution to a term."""
-        if term.is_variable and term.name in substitution:
-            return substitution[term.name]
+        """Apply substitution to a term, resolving chains of bindings."""
+        term = Unification.walk(term, substitution)
         
         if term.args:
             new_args = []
             for arg in term.args:
                 if isinstance(arg, Term):
                     new_args.append(Unification.substitute(arg, substitution))
-                elif isinstance(arg, str) and arg.isupper() and arg in substitution:
-                    new_args.append(substitution[arg])
+                elif _is_var(arg) and arg in substitution:
+                    new_args.append(Unification.substitute(substitution[arg], substitution))
                 else:
                     new_args.append(arg)
-            return Term(term.name, new_args)
+            return Term.intern(term.name, new_args)
         
         return term
 
+# Trace record kinds and how each is rendered by format_trace()
+TRACE_MESSAGES = {
+    "try": "Trying to prove: {}",
+    "known": "✓ Known fact: {}",
+    "tabled": "Reusing tabled answers for: {}",
+    "partial": "Reusing answers found so far for: {}",
+    "unified": "Unified with: {}",
+    "fact": "✓ Fact proven: {}",
+    "body": "Proving body conditions...",
+    "fail": "✗ Cannot prove: {}",
+}
+
 class BackwardsChainingEngine:
-    """A backwards chaining inference engine with unification."""
+    """A backwards chaining inference engine with unification.
+    
+    Answers to each goal are tabled: once a call completes, its answers are
+    stored under the call's variant key (the goal with bindings applied and
+    variables numbered in order of appearance), and later variant calls
+    reuse them instead of re-deriving. A variant call made while the
+    original is still running reads the answers found so far; the original
+    then re-runs its clauses until no new answers appear.
+    
+    With tracing enabled, each step is recorded as a (depth, kind, subject)
+    tuple and only rendered to text by format_trace().
+    """
     
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, tracing=False):
         self.kb = knowledge_base
-        self.trace = []
-        self.call_stack = []  # To prevent infinite recursion
+        self.tracing = tracing
+        self.trace = []  # (depth, kind, subject) records; see TRACE_MESSAGES
+        self.table = {}  # Variant key -> answers (goal instances) of a completed call
+        self._table_generation = knowledge_base.generation
+        self._in_progress = {}  # Variant key -> answers so far, in call order
+        self._reentered = set()  # In-progress keys that a recursive variant call read
+        self._incomplete = set()  # In-progress keys that depend on a reentered caller
+        self._gensym = 0  # Next stamp for renaming clause variables apart
     
     def prove(self, goal, substitution=None, depth=0):
         """
         Attempt to prove a goal using backwards chaining with unification.
-        Returns list of successful substitutions.
+        Yields successful substitutions.
+        
+        A ground goal stops at its first proof, since any other proof gives
+        the same answer. Other goals are evaluated to completion, so their
+        answers can be tabled, and then yielded one by one.
         """
         if substitution is None:
             substitution = {}
         
-        indent = "  " * depth
-        goal_str = str(Unification.substitute(goal, substitution))
-        self.trace.append(f"{indent}Trying to prove: {goal_str}")
+        if self._table_generation != self.kb.generation:
+            # The knowledge base changed since the answers were tabled
+            self.table.clear()
+            self._table_generation = self.kb.generation
+        
+        resolved = Unification.substitute(goal, substitution)
+        self._log(depth, "try", resolved)
         
-        # Check for infinite recursion
-        if (goal, tuple(sorted(substitution.items()))) in self.call_stack:
-            self.trace.append(f"{indent}✗ Infinite recursion detected")
-            return []
+        key, is_ground = self._variant_key(resolved)
         
-        self.call_stack.append((goal, tuple(sorted(substitution.items()))))
+        # A ground goal that is a known fact needs no clause scan or unification
+        if is_ground and key in self.kb.facts:
+            self._log(depth, "known", resolved)
+            yield substitution
+            return
         
-        solutions = []
+        if key in self.table:
+            self._log(depth, "tabled", resolved)
+            if not self.table[key]:
+                self._log(depth, "fail", resolved)
+            yield from self._answer_substitutions(goal, substitution, self.table[key])
+            return
         
-        # Get all potentially matching clauses
-        matching_clauses = self.kb.get_matching_clauses(goal)
+        if key in self._in_progress:
+            # Recursive variant call: use what the running call has found so far
+            self._log(depth, "partial", resolved)
+            self._reentered.add(key)
+            callers = list(self._in_progress)
+            self._incomplete.update(callers[callers.index(key) + 1:])
+            yield from self._answer_substitutions(goal, substitution, list(self._in_progress[key]))
+            return
         
-        for clause in matching_clauses:
-            # Rename variables in the clause to avoid conflicts
-            renamed_clause = self._rename_variables(clause, depth)
-            
-            # Try to unify the goal with the clause head
-            unified_sub = Unification.unify(goal, renamed_clause.head, substitution.copy())
-            
-            if unified_sub is not None:
-                self.trace.append(f"{indent}Unified with: {renamed_clause}")
+        answers = []
+        seen = set()
+        self._in_progress[key] = answers
+        try:
+            while True:
+                self._reentered.discard(key)
+                found_new = False
                 
-                if renamed_clause.is_fact():
-                    # It's a fact, we're done
-                    self.trace.append(f"{indent}✓ Fact proven: {goal_str}")
-                    solutions.append(unified_sub)
-                else:
-                    # It's a rule, need to prove all body conditions
-                    self.trace.append(f"{indent}Proving body conditions...")
-                    body_solutions = self._prove_body(renamed_clause.body, unified_sub, depth + 1)
-                    solutions.extend(body_solutions)
-        
-        self.call_stack.pop()
-        
-        if not solutions:
-            self.trace.append(f"{indent}✗ Cannot prove: {goal_str}")
-        
-        return solutions
-    
-    def _prove_body(self, body_conditions, substitution, depth):
-        """Prove all conditions in the body of a rule."""
-        if not body_conditions:
-            return [substitution]
-        
-        solutions = []
-        first_condition = body_conditions[0]
-        remaining_conditions = body_conditions[1:]
-        
-        # Prove the first condition
-        first_solutions = self.prove(first_condition, substitution, depth)
-        
-        # For each solution of the first condition, prove the remaining ones
-        for solution in first_solutions:
-            remaining_solutions = self._prove_body(remaining_conditions, solution, depth)
-            solutions.extend(remaining_solutions)
-        
-        return solutions
-    
-    def _rename_variables(self, clause, suffix):
-        """Rename variables in a clause to avoid conflicts."""
-        var_mapping = {}
-        
-        def rename_term(term):
-            if term.is_variable:
-                if term.name not in var_mapping:
-                    var_mapping[term.name] = f"{term.name}_{suffix}"
-                return Term(var_mapping[term.name])
-            elif term.args:
-                new_args = []
-                for arg in term.args:
-                    if isinstance(arg, Term):
-                        new_args.append(rename_term(arg))
-                    elif isinstance(arg, str) and arg.isupper():
-                        if arg not in var_mapping:
-                            var_mapping[arg] = f"{arg}_{suffix}"
-                        new_args.append(var_mapping[arg])
+                # Get all potentially matching clauses
+                for clause in self.kb.get_candidate_clauses(key):
+                    # Rename variables in the clause to avoid conflicts
+                    renamed_clause = self._rename_variables(clause)
+                    
+                    # Try to unify the goal with the clause head
+                    unified_sub = Unification.unify(goal, renamed_clause.head, substitution.copy())
+                    
+                    if unified_sub is None:
+                        continue
+                    
+                    self._log(depth, "unified", renamed_clause)
+                    
+                    if renamed_clause.is_fact():
+                        # It's a fact, we're done
+                        self._log(depth, "fact", resolved)
+                        clause_solutions = iter((unified_sub,))
                     else:
-                        new_args.append(arg)
-                return Term(term.name, new_args)
-            return term
+                        # It's a rule, need to prove all body conditions
+                        self._log(depth, "body")
+                        clause_solutions = self.prove_all(renamed_clause.body, unified_sub, depth + 1)
+                    
+                    # Body solutions are streamed; only answers that are not
+                    # variants of earlier ones are kept, since fresh variable
+                    # stamps make every non-ground answer a new Term
+                    for solution in clause_solutions:
+                        answer = Unification.substitute(goal, solution)
+                        variant = self._variant_key(answer)[0]
+                        if variant not in seen:
+                            seen.add(variant)
+                            answers.append(answer)
+                            found_new = True
+                            if is_ground:
+                                break
+                    
+                    if is_ground and answers:
+                        if not renamed_clause.is_fact():
+                            clause_solutions.close()
+                        break
+                
+                # A variant call read a partial answer list; repeat until it is complete
+                if (is_ground and answers) or key not in self._reentered or not found_new:
+                    break
+        finally:
+            del self._in_progress[key]
+            self._reentered.discard(key)
+        
+        # A found ground answer is final even if it relied on partial answers
+        complete = key not in self._incomplete or (is_ground and answers)
+        self._incomplete.discard(key)
+        if complete and all(self._variant_key(answer)[1] for answer in answers):
+            self.table[key] = answers
+        
+        if not answers:
+            self._log(depth, "fail", resolved)
+        
+        yield from self._answer_substitutions(goal, substitution, answers)
+    
+    def _log(self, depth, kind, subject=None):
+        """Record a trace step if tracing is enabled; formatting is deferred."""
+        if self.tracing:
+            self.trace.append((depth, kind, subject))
+    
+    def format_trace(self):
+        """Render the recorded trace steps as indented lines."""
+        return ["  " * depth + TRACE_MESSAGES[kind].format(subject)
+                for depth, kind, subject in self.trace]
+    
+    def _answer_substitutions(self, goal, substitution, answers):
+        """Extend substitution so that goal matches each answer in turn."""
+        for answer in answers:
+            solution = Unification.unify(goal, answer, substitution.copy())
+            if solution is not None:
+                yield solution
+    
+    def _variant_key(self, term):
+        """
+        Return (key, is_ground) for a fully substituted term. Variables in the
+        key are numbered by first appearance and atoms are plain names, so a
+        ground key has the same shape as the facts in the knowledge base.
+        """
+        numbering = {}
         
-        new_head = rename_term(clause.head)
-        new_body = [rename_term(term) for term in clause.body]
+        def canonical(arg):
+            if isinstance(arg, Term):
+                if arg.is_variable:
+                    return numbering.setdefault(arg.name, _VarSlot(len(numbering)))
+                if not arg.args:
+                    return arg.name
+                return Term.intern(arg.name, [canonical(a) for a in arg.args])
+            if _is_var(arg):
+                return numbering.setdefault(arg, _VarSlot(len(numbering)))
+            return arg
+        
+        key = Term.intern(term.name, [canonical(arg) for arg in term.args])
+        return key, not numbering
+    
+    def prove_all(self, goals, substitution=None, depth=0):
+        """
+        Prove a conjunction of goals left to right.
+        Yields each substitution that satisfies all of them.
+        """
+        if substitution is None:
+            substitution = {}
+        
+        if not goals:
+            yield substitution
+            return
+        
+        # stack[i] streams the solutions of goals[i], so the body is not sliced
+        # into sublists; each entry is still a live prove() generator, and
+        # proving a rule body nests prove() -> prove_all() -> prove()
+        last = len(goals) - 1
+        stack = [self.prove(goals[0], substitution, depth)]
+        try:
+            while stack:
+                solution = next(stack[-1], None)
+                if solution is None:
+                    stack.pop()
+                elif len(stack) - 1 == last:
+                    yield solution
+                else:
+                    stack.append(self.prove(goals[len(stack)], solution, depth))
+        finally:
+            # Stopped early: release the goals still being iterated
+            for pending in stack:
+                pending.close()
+    
+    def _rename_variables(self, clause):
+        """Rename variables in a clause apart by stamping them with a fresh integer."""
+        if not clause.vars:
+            return clause  # Nothing to rename; reuse the stored clause
+        
+        stamp = self._gensym
+        self._gensym += 1
+        var_mapping = {var: Term.intern((var, stamp)) for var in clause.vars}
+        
+        new_head = Unification.substitute(clause.head, var_mapping)
+        new_body = [Unification.substitute(term, var_mapping) for term in clause.body]
         return Clause(new_head, new_body)
     
     def query(self, predicate, *args):
         """Query the knowledge base."""
         self.trace = []
-        self.call_stack = []
-        goal = Term(predicate, list(args))
-        solutions = self.prove(goal)
-        return solutions, self.trace
+        goal = Term.intern(predicate, args)
+        solutions = list(self.prove(goal))
+        return solutions, self.format_trace()
+    
+    def ask(self, predicate, *args):
+        """Return whether a query has at least one solution, stopping at the first."""
+        self.trace = []
+        goal = Term.intern(predicate, args)
+        return next(self.prove(goal), None) is not None
 
 # Example usage with family relationships
 def demo_family_relationships():
@@ -299,7 +535,7 @@ def demo_family_relationships():
     kb.print_knowledge_base()
     
     # Create inference engine
-    engine = BackwardsChainingEngine(kb)
+    engine = BackwardsChainingEngine(kb, tracing=True)
     
     # Test queries
     queries = [
@@ -361,7 +597,7 @@ def demo_animal_classification():
     
     kb.print_knowledge_base()
     
-    engine = BackwardsChainingEngine(kb)
+    engine = BackwardsChainingEngine(kb, tracing=True)
     
     queries = [
         ("bird", "tweety"),